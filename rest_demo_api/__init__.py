@@ -6,21 +6,60 @@ __version__ = "0.0.1"
 
 import logging
 
-import attr
-from flask import Flask, jsonify
+from flask import Flask
+from werkzeug.exceptions import MethodNotAllowed
 
-from ._api import get_api
+from ._api import get_api, json_response
 from ._config import get_config
-from ._db import get_db
+from ._db import configure_engine, get_db
+from ._routing import TrieMap
 from .exceptions import Error
 
 _CACHED_APP = None
+# Paths answered before the request reaches Flask
+# TODO: Check DB connection for /-/healthy
+_PROBE_PATHS = frozenset(["/-/alive", "/-/healthy"])
+_PROBE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 
 def _handle_errors(error):
-    response = jsonify(attr.asdict(error))
-    response.status_code = error.response_code
-    return response
+    # Error has a fixed shape, so skip attr.asdict's introspection
+    return json_response(
+        {
+            "error_name": error.error_name,
+            "message": error.message,
+            "response_code": error.response_code,
+        },
+        status=error.response_code,
+    )
+
+
+def _answer_probes(wsgi_app):
+    """
+    Wrap a WSGI application, answering liveness/health checks directly.
+
+    Probes are polled constantly and their responses are always empty,
+    so they skip Flask's routing and request handling entirely.
+
+    :param wsgi_app: The WSGI application to wrap.
+
+    :returns: The wrapped WSGI application.
+    """
+
+    def probe_app(environ, start_response):
+        if environ.get("PATH_INFO") not in _PROBE_PATHS:
+            return wsgi_app(environ, start_response)
+        method = environ.get("REQUEST_METHOD")
+        if method in ("GET", "HEAD"):
+            start_response("204 NO CONTENT", [])
+            return []
+        allow = [("Allow", ", ".join(_PROBE_METHODS))]
+        if method == "OPTIONS":
+            start_response("200 OK", allow)
+            return []
+        return MethodNotAllowed(valid_methods=_PROBE_METHODS)(environ, start_response)
+
+    return probe_app
 
 
 def get_app(config=None):
@@ -41,6 +80,15 @@ def get_app(config=None):
     app_instance = Flask(__name__.split(".")[0])
     _CACHED_APP = app_instance
 
+    # Match URLs with a route tree, rather than trying every rule in turn
+    url_map = TrieMap(host_matching=app_instance.url_map.host_matching)
+    for rule in app_instance.url_map.iter_rules():
+        url_map.add(rule.empty())
+    app_instance.url_map = url_map
+
+    # Answer liveness/health checks without going through Flask
+    app_instance.wsgi_app = _answer_probes(app_instance.wsgi_app)
+
     # Register error handling
     app_instance.register_error_handler(Error, _handle_errors)
 
@@ -48,12 +96,17 @@ def get_app(config=None):
     if config is None:
         config = get_config()
     app_instance.config.from_object(config.flask)
+    # Compact, unsorted output for anything serialized via flask.json
+    app_instance.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
+    app_instance.config["JSON_SORT_KEYS"] = False
 
     # Init DB
     database = get_db()
     database.init_app(app_instance)
-    if not config.skip_db_setup:
-        with app_instance.app_context():
+    with app_instance.app_context():
+        # Before create_all (or anything else) connects
+        configure_engine(database.get_engine(app_instance))
+        if not config.skip_db_setup:
             database.create_all()
 
     # Init API
@@ -3,7 +3,13 @@
 # pylint: disable=R0201
 
 
-from flask import Response, jsonify, render_template, request
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from functools import partial, update_wrapper, wraps
+from hashlib import blake2b, sha256
+
+import orjson
+from flask import Response, render_template, request
 from flask_restful import Api, Resource
 
 from ._crud import (
@@ -12,21 +18,31 @@ from ._crud import (
     create_quote,
     delete_author,
     delete_quote,
-    get_total_number_of_author_quotes,
-    get_total_number_of_authors,
-    get_total_number_of_quotes,
     list_author_quotes,
+    list_author_quotes_with_total,
     list_authors,
+    list_authors_with_total,
     list_quotes,
+    list_quotes_with_total,
     read_author,
     read_quote,
     update_author,
     update_quote,
 )
-from ._schemas import AUTHOR_SCHEMA, AUTHORS_SCHEMA, QUOTE_SCHEMA, QUOTES_SCHEMA
+from ._schemas import (
+    Page,
+    dump_author_json,
+    dump_authors_json,
+    dump_quote_json,
+    dump_quotes_json,
+)
 from .exceptions import Error
 
 _CACHED_API = None
+_CACHED_BODIES = {}
+_COLLECTION_URLS = {}
+# The largest integer databases take (a signed 64 bit integer)
+_MAX_DB_INTEGER = 2 ** 63 - 1
 
 
 def get_api():
@@ -41,14 +57,16 @@ def get_api():
     if _CACHED_API is not None:
         return _CACHED_API
     api = Api()
+    # Serialize anything resources return, rather than a response, with orjson
+    api.representations["application/json"] = output_json
     api.add_resource(Root, "/")
+    # The schemas format entity URLs as "<collection URL>/<pk>",
+    # so keep entities' routes under their collection's
     api.add_resource(Authors, "/authors")
     api.add_resource(Author, "/authors/<int:pk>")
     api.add_resource(AuthorQuotes, "/authors/<int:pk>/quotes")
     api.add_resource(Quotes, "/quotes")
     api.add_resource(Quote, "/quotes/<int:pk>")
-    api.add_resource(LivenessCheck, "/-/alive")
-    api.add_resource(HealthCheck, "/-/healthy")
     api.add_resource(Docs, "/docs")
     api.add_resource(Spec, "/spec")
     _CACHED_API = api
@@ -64,17 +82,261 @@ def get_request_json(required=True):
     :rtype: dict
     :returns: The JSON body of the request
     """
-    rjson = request.get_json()
-    if not rjson and required:
+    # The body is only read once, so don't keep a copy on the request
+    raw = request.get_data(cache=False) if request.is_json else None
+    data = None
+    if raw:
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            raise Error(
+                error_name="InvalidJSON",
+                message="Malformed JSON body.",
+                response_code=400,
+            )
+    # Empty documents, eg: null or {}, don't hold any data either
+    if not data:
+        if required:
+            raise Error(
+                error_name="NoDataError",
+                message="You didn't submit any JSON data!",
+                response_code=400,
+            )
+        return None
+    if not isinstance(data, dict):
         raise Error(
-            error_name="NoDataError",
-            message="You didn't submit any JSON data!",
+            error_name="InvalidJSON",
+            message="The JSON body has to be an object.",
             response_code=400,
         )
-    return rjson
+    return data
+
+
+def json_response(data, status=200):
+    """
+    Serialize data into a JSON response.
+
+    :param data: The (JSON serializable) data to put in the response body,
+        or bytes which are already JSON.
+    :param int status: The status code of the response.
+
+    :rtype: flask.Response
+    """
+    if not isinstance(data, bytes):
+        data = orjson.dumps(data)
+    return Response(data, status=status, mimetype="application/json")
+
+
+def output_json(data, code, headers=None):
+    """
+    Flask-RESTful representation serializing data with orjson.
+
+    :param data: The data a resource returned.
+    :param int code: The status code of the response.
+    :param headers: Any headers the resource returned.
+
+    :rtype: flask.Response
+    """
+    resp = json_response(data, status=code)
+    resp.headers.extend(headers or {})
+    return resp
+
+
+def get_paging_args():
+    """
+    Get the pagination arguments of a request.
+
+    Invalid or out of range values are replaced or clamped.
+
+    :rtype: tuple
+    :returns: The offset (>= 0), the limit (1-50), and the primary key
+        decoded from the after cursor (or None).
+    """
+    offset = max(0, request.args.get("offset", 0, type=int))
+    if offset > _MAX_DB_INTEGER:
+        # Far past the end of any collection
+        raise _page_not_found()
+    limit = min(50, max(1, request.args.get("limit", 50, type=int)))
+    return offset, limit, decode_cursor(request.args.get("after"))
+
+
+def _page_not_found():
+    """
+    Produce the error for a page past the end of a collection.
+
+    :rtype: Error
+    """
+    return Error(
+        error_name="PageNotFound", message="No data on that page!", response_code=404
+    )
+
+
+def get_page(list_items, list_items_with_total, base_url):
+    """
+    Fetch the page of a collection a request asks for.
+
+    The total size of the collection is only included if the request
+    asks for it, in which case it is fetched along with the page.
+
+    :param list_items: Lists (limit, offset, after) entities.
+    :param list_items_with_total: Lists (limit, offset, after) entities,
+        along with the total number of entities.
+    :param str base_url: The URL of the collection.
+
+    :rtype: Page
+    """
+    offset, limit, after = get_paging_args()
+    extra = {}
+    # Fetch one extra row to find out if there is a next page
+    if request.args.get("include_total") in ("1", "true"):
+        items, extra["total"] = list_items_with_total(limit + 1, offset, after)
+    else:
+        items = list_items(limit + 1, offset, after)
+    if not items:
+        raise _page_not_found()
+    if len(items) <= limit:
+        next_page = None
+    else:
+        items = items[:limit]
+        next_page = next_page_url(base_url, limit, items[-1].id)
+    return Page(items=items, next_page=next_page, limit=limit, offset=offset, **extra)
+
+
+def collection_url(resource):
+    """
+    Return the URL of a collection resource which takes no URL variables.
+
+    The URL is only built once, on the first request which needs it.
+
+    :param resource: The resource class.
+
+    :rtype: str
+    """
+    if resource not in _COLLECTION_URLS:
+        _COLLECTION_URLS[resource] = get_api().url_for(resource)
+    return _COLLECTION_URLS[resource]
+
+
+def next_page_url(base_url, limit, last_pk):
+    """
+    Produce the URL of the page following an entity in a collection.
 
+    :param str base_url: The URL of the collection.
+    :param int limit: The number of items per page.
+    :param int last_pk: The primary key of the last entity on this page.
 
-class Root(Resource):
+    :rtype: str
+    """
+    return "{}?limit={}&after={}".format(base_url, limit, encode_cursor(last_pk))
+
+
+def static_response(key, produce, mimetype="application/json"):
+    """
+    Serve a response body which never changes while the process runs.
+
+    The body is produced on the first request for it and reused after
+    that. Responses carry an ETag and are cacheable by clients.
+
+    :param key: The key to cache the body under.
+    :param produce: A function returning the body, as bytes.
+    :param str mimetype: The mimetype of the body.
+
+    :rtype: flask.Response
+    """
+    if key not in _CACHED_BODIES:
+        body = produce()
+        _CACHED_BODIES[key] = (body, sha256(body).hexdigest())
+    body, etag = _CACHED_BODIES[key]
+    resp = Response(body, mimetype=mimetype)
+    resp.set_etag(etag)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 3600
+    return resp.make_conditional(request)
+
+
+def conditional(method):
+    """
+    Decorate a GET method to tag its responses with an ETag of their body.
+
+    Requests which already hold the current ETag get an empty 304 response
+    rather than the body again. The ETag only depends on the body, so every
+    process agrees on it, and it changes as soon as the data does.
+
+    :param method: The resource method to decorate.
+    """
+
+    @wraps(method)
+    def conditional_method(*args, **kwargs):
+        resp = method(*args, **kwargs)
+        resp.set_etag(blake2b(resp.get_data(), digest_size=16).hexdigest())
+        # Clients may keep the response, but have to check it's current
+        resp.cache_control.no_cache = True
+        return resp.make_conditional(request)
+
+    return conditional_method
+
+
+def encode_cursor(pk):
+    """
+    Produce an opaque pagination cursor pointing after an entity.
+
+    :param int pk: The primary key of the last entity on a page.
+
+    :rtype: str
+    :returns: The cursor, which is safe to use in a URL as is.
+    """
+    return urlsafe_b64encode(str(pk).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Recover the primary key from an opaque pagination cursor.
+
+    :param str cursor: A cursor produced by :func:`encode_cursor`, or None.
+
+    :rtype: int
+    :returns: The primary key the cursor points after, or None if no
+        cursor was provided.
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        pk = int(urlsafe_b64decode(padded.encode("ascii")))
+    except (BinasciiError, UnicodeError, ValueError):
+        pk = None
+    if pk is None or abs(pk) > _MAX_DB_INTEGER:
+        raise Error(
+            error_name="InvalidCursorError",
+            message="That page cursor isn't valid!",
+            response_code=400,
+        )
+    return pk
+
+
+class SingletonResource(Resource):
+    """
+    A resource which is only instantiated once.
+
+    Flask-RESTful builds a new instance of a resource for every request
+    it dispatches. None of these resources keep any per-request state,
+    so a single instance serves every request instead.
+    """
+
+    @classmethod
+    def as_view(cls, name, *class_args, **class_kwargs):
+        """Return a view function dispatching to a single instance."""
+        view = super().as_view(name, *class_args, **class_kwargs)
+        instance = cls(*class_args, **class_kwargs)
+
+        def singleton_view(*args, **kwargs):
+            return instance.dispatch_request(*args, **kwargs)
+
+        # Carries over view_class, methods, etc. for Flask and apispec
+        return update_wrapper(singleton_view, view)
+
+
+class Root(SingletonResource):
     """A mapping of the API."""
 
     def get(self):
@@ -83,12 +345,18 @@ class Root(Resource):
 
         :rtype: flask.Response
         """
-        return {"authors": "/authors{/id}", "quotes": "/quotes{/id}"}
+        return static_response(
+            "root",
+            lambda: orjson.dumps(
+                {"authors": "/authors{/id}", "quotes": "/quotes{/id}"}
+            ),
+        )
 
 
-class Authors(Resource):
+class Authors(SingletonResource):
     """Functionality for the Authors collection."""
 
+    @conditional
     def get(self):  # noqa: D413
         """
         Return a list of authors.
@@ -96,18 +364,33 @@ class Authors(Resource):
         ---
         description: Get a list of authors.
         parameters:
+            - in: query
+              name: after
+              schema:
+                  type: string
+              description: >-
+               An opaque cursor, as found in next_page, marking
+               where the result set begins.
             - in: query
               name: offset
+              deprecated: true
               schema:
                   type: integer
               description: >-
                The number of items to skip before beginning
-               to collect the result set.
+               to collect the result set. Use after instead.
             - in: query
               name: limit
               schema:
                   type: integer
               description: The maximum number of items to return.
+            - in: query
+              name: include_total
+              schema:
+                  type: boolean
+              description: >-
+               Whether or not to include the (possibly slightly stale)
+               total number of items.
         responses:
             200:
                 description: The list of authors was retrieved.
@@ -116,34 +399,11 @@ class Authors(Resource):
                         schema: AuthorList
             404:
                 description: There is no content on the specified page.
+            400:
+                description: The page cursor is invalid.
         """
-        limit = int(request.args.get("limit", 50))
-        if limit > 50:
-            limit = 50
-        offset = int(request.args.get("offset", 0))
-        total_num = get_total_number_of_authors()
-        if total_num <= offset:
-            raise Error(
-                error_name="PageNotFound",
-                message="No data on that page!",
-                response_code=404,
-            )
-        if offset + limit >= total_num:
-            next_page = None
-        else:
-            next_page = get_api().url_for(Authors, limit=limit, offset=offset + limit)
-        author_list = list_authors(limit, offset)
-        return jsonify(
-            AUTHORS_SCHEMA.dump(
-                {
-                    "items": author_list,
-                    "next_page": next_page,
-                    "limit": limit,
-                    "offset": offset,
-                    "total": total_num,
-                }
-            ).data
-        )
+        page = get_page(list_authors, list_authors_with_total, collection_url(Authors))
+        return json_response(dump_authors_json(page))
 
     def post(self):  # noqa: D413
         """
@@ -170,14 +430,13 @@ class Authors(Resource):
         """
         rjson = get_request_json()
         new_author = create_author(rjson)
-        resp = jsonify(AUTHOR_SCHEMA.dump(new_author).data)
-        resp.status_code = 201
-        return resp
+        return json_response(dump_author_json(new_author), status=201)
 
 
-class Author(Resource):
+class Author(SingletonResource):
     """Functionality for Author instances."""
 
+    @conditional
     def get(self, pk):  # noqa: D413
         """
         Return an author.
@@ -201,7 +460,7 @@ class Author(Resource):
                 description: An author with that primary key wasn't found.
         """
         author = read_author(pk)
-        return jsonify(AUTHOR_SCHEMA.dump(author).data)
+        return json_response(dump_author_json(author))
 
     def put(self, pk):  # noqa: D413
         """
@@ -232,10 +491,12 @@ class Author(Resource):
                 description: An author with that primary key wasn't found.
             422:
                 description: Schema validation error.
+            400:
+                description: Another author already has that name.
         """
         rjson = get_request_json()
         updated_author = update_author(pk, rjson)
-        return jsonify(AUTHOR_SCHEMA.dump(updated_author).data)
+        return json_response(dump_author_json(updated_author))
 
     def patch(self, pk):  # noqa: D413
         """
@@ -266,10 +527,12 @@ class Author(Resource):
                 description: An author with that primary key wasn't found.
             422:
                 description: Schema validation error.
+            400:
+                description: Another author already has that name.
         """
         rjson = get_request_json()
         updated_author = update_author(pk, rjson, partial=True)
-        return jsonify(AUTHOR_SCHEMA.dump(updated_author).data)
+        return json_response(dump_author_json(updated_author))
 
     def delete(self, pk):  # noqa: D413
         """
@@ -294,9 +557,10 @@ class Author(Resource):
         return Response(status=204)
 
 
-class AuthorQuotes(Resource):
+class AuthorQuotes(SingletonResource):
     """Quotes endpoint with an implicit author."""
 
+    @conditional
     def get(self, pk):  # noqa: D413
         """
         Get a list of quotes by this author.
@@ -304,18 +568,33 @@ class AuthorQuotes(Resource):
         ---
         description: Get a list of quotes by the author.
         parameters:
+            - in: query
+              name: after
+              schema:
+                  type: string
+              description: >-
+               An opaque cursor, as found in next_page, marking
+               where the result set begins.
             - in: query
               name: offset
+              deprecated: true
               schema:
                   type: integer
               description: >-
                The number of items to skip before beginning
-               to collect the result set.
+               to collect the result set. Use after instead.
             - in: query
               name: limit
               schema:
                   type: integer
               description: The maximum number of items to return.
+            - in: query
+              name: include_total
+              schema:
+                  type: boolean
+              description: >-
+               Whether or not to include the (possibly slightly stale)
+               total number of items.
             - in: path
               name: pk
               description: The primary key of the author
@@ -332,36 +611,15 @@ class AuthorQuotes(Resource):
                 description: >-
                  An author with that primary key wasn't found,
                  or there is no data on the specified page.
+            400:
+                description: The page cursor is invalid.
         """
-        limit = int(request.args.get("limit", 50))
-        if limit > 50:
-            limit = 50
-        offset = int(request.args.get("offset", 0))
-        total_num = get_total_number_of_author_quotes(pk)
-        if total_num <= offset:
-            raise Error(
-                error_name="PageNotFound",
-                message="No data on that page!",
-                response_code=404,
-            )
-        if offset + limit >= total_num:
-            next_page = None
-        else:
-            next_page = get_api().url_for(
-                AuthorQuotes, limit=limit, offset=offset + limit, pk=pk
-            )
-        author_quote_list = list_author_quotes(pk, limit, offset)
-        return jsonify(
-            QUOTES_SCHEMA.dump(
-                {
-                    "items": author_quote_list,
-                    "next_page": next_page,
-                    "limit": limit,
-                    "offset": offset,
-                    "total": total_num,
-                }
-            ).data
+        page = get_page(
+            partial(list_author_quotes, pk),
+            partial(list_author_quotes_with_total, pk),
+            "{}/{}/quotes".format(collection_url(Authors), pk),
         )
+        return json_response(dump_quotes_json(page))
 
     def post(self, pk):  # noqa: D413
         """
@@ -395,14 +653,13 @@ class AuthorQuotes(Resource):
         """
         rjson = get_request_json()
         new_author_quote = create_author_quote(pk, rjson)
-        resp = jsonify(QUOTE_SCHEMA.dump(new_author_quote).data)
-        resp.status_code = 201
-        return resp
+        return json_response(dump_quote_json(new_author_quote), status=201)
 
 
-class Quotes(Resource):
+class Quotes(SingletonResource):
     """Functionality for the Quotes collection."""
 
+    @conditional
     def get(self):  # noqa: D413
         """
         Get a list of quotes.
@@ -410,18 +667,33 @@ class Quotes(Resource):
         ---
         description: Get list of quotes.
         parameters:
+            - in: query
+              name: after
+              schema:
+                  type: string
+              description: >-
+               An opaque cursor, as found in next_page, marking
+               where the result set begins.
             - in: query
               name: offset
+              deprecated: true
               schema:
                   type: integer
               description: >-
                The number of items to skip before beginning
-               to collect the result set.
+               to collect the result set. Use after instead.
             - in: query
               name: limit
               schema:
                   type: integer
               description: The maximum number of items to return.
+            - in: query
+              name: include_total
+              schema:
+                  type: boolean
+              description: >-
+               Whether or not to include the (possibly slightly stale)
+               total number of items.
         responses:
             200:
                 description: The quote listing was retrieved.
@@ -430,34 +702,11 @@ class Quotes(Resource):
                         schema: QuoteList
             404:
                 description: There is no content on the specified page.
+            400:
+                description: The page cursor is invalid.
         """
-        limit = int(request.args.get("limit", 50))
-        if limit > 50:
-            limit = 50
-        offset = int(request.args.get("offset", 0))
-        total_num = get_total_number_of_quotes()
-        if total_num <= offset:
-            raise Error(
-                error_name="PageNotFound",
-                message="No data on that page!",
-                response_code=404,
-            )
-        if offset + limit >= total_num:
-            next_page = None
-        else:
-            next_page = get_api().url_for(Quotes, limit=limit, offset=offset + limit)
-        quote_list = list_quotes(limit, offset)
-        return jsonify(
-            QUOTES_SCHEMA.dump(
-                {
-                    "items": quote_list,
-                    "next_page": next_page,
-                    "limit": limit,
-                    "offset": offset,
-                    "total": total_num,
-                }
-            ).data
-        )
+        page = get_page(list_quotes, list_quotes_with_total, collection_url(Quotes))
+        return json_response(dump_quotes_json(page))
 
     def post(self):  # noqa: D413
         """
@@ -484,14 +733,13 @@ class Quotes(Resource):
         """
         rjson = get_request_json()
         new_quote = create_quote(rjson)
-        resp = jsonify(QUOTE_SCHEMA.dump(new_quote).data)
-        resp.status_code = 201
-        return resp
+        return json_response(dump_quote_json(new_quote), status=201)
 
 
-class Quote(Resource):
+class Quote(SingletonResource):
     """Functionality for Quote instances."""
 
+    @conditional
     def get(self, pk):  # noqa: D413
         """
         Get a quote.
@@ -515,7 +763,7 @@ class Quote(Resource):
                 description: A quote with that primary key wasn't found.
         """
         quote = read_quote(pk)
-        return jsonify(QUOTE_SCHEMA.dump(quote).data)
+        return json_response(dump_quote_json(quote))
 
     def delete(self, pk):  # noqa: D413
         """
@@ -571,7 +819,7 @@ class Quote(Resource):
         """
         rjson = get_request_json()
         updated_quote = update_quote(pk, rjson)
-        return jsonify(QUOTE_SCHEMA.dump(updated_quote).data)
+        return json_response(dump_quote_json(updated_quote))
 
     def patch(self, pk):  # noqa: D413
         """
@@ -605,53 +853,24 @@ class Quote(Resource):
         """
         rjson = get_request_json()
         updated_quote = update_quote(pk, rjson, partial=True)
-        return jsonify(QUOTE_SCHEMA.dump(updated_quote).data)
-
-
-class LivenessCheck(Resource):
-    """Liveness endpoint."""
-
-    def get(self):  # noqa: D413
-        """
-        Determine if the application is alive.
-
-        ---
-        description: Check the application is alive.
-        responses:
-            204:
-                description: It is!
-        """
-        return Response(status=204)
+        return json_response(dump_quote_json(updated_quote))
 
 
-class HealthCheck(Resource):
-    """Health check endpoint."""
-
-    def get(self):  # noqa: D413
-        """
-        Determine if the application is healthy.
-
-        ---
-        description: Check the application is healthy.
-        responses:
-            204:
-                description: It is!
-        """
-        # TODO: Check DB connection
-        return Response(status=204)
-
-
-class Docs(Resource):
+class Docs(SingletonResource):
     """Return the docs."""
 
     def get(self):
         """Get the docs."""
-        resp = Response(render_template("docs.html", docs_url=get_api().url_for(Spec)))
-        resp.mimetype = "text/html"
-        return resp
+        return static_response(
+            "docs",
+            lambda: render_template(
+                "docs.html", docs_url=get_api().url_for(Spec)
+            ).encode("utf-8"),
+            mimetype="text/html",
+        )
 
 
-class Spec(Resource):
+class Spec(SingletonResource):
     """Return the swagger spec."""
 
     def get(self):
@@ -659,4 +878,4 @@ class Spec(Resource):
         # Avoid a cyclic import...
         from ._spec import get_spec
 
-        return get_spec()
+        return static_response("spec", lambda: orjson.dumps(get_spec()))
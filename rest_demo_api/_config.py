@@ -1,27 +1,21 @@
 """API Configuration."""
 
-import sys
+from secrets import token_hex
 
 import environ
 from attr.validators import in_
 
+_VERBOSITY_LEVELS = frozenset(["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"])
+
 
 def _gen_secret_key():
     """
-    Python version aware secret key generator.
-
-    Uses os.urandom for py<3.6, otherwise sercrets.token_hex.
+    Generate a random secret key.
 
     :rtype: str
     :returns: a secret key
     """
-    if sys.version_info[0] >= 3 and sys.version_info[1] >= 6:
-        from secrets import token_hex
-
-        return token_hex(32)
-    from os import urandom
-
-    return str(urandom(32))
+    return token_hex(32)
 
 
 class Configuration:  # pylint: disable=R0903
@@ -39,12 +33,17 @@ class Configuration:  # pylint: disable=R0903
 
     flask = environ.group(FlaskConfig)
     skip_db_setup = environ.bool_var(False)
-    verbosity = environ.var(
-        "WARNING", validator=in_(["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"])
-    )
+    verbosity = environ.var("WARNING", validator=in_(_VERBOSITY_LEVELS))
 
 
-def get_config():
-    """Return the configuration object."""
+def get_config(env=None):
+    """
+    Return the configuration object.
+
+    :param dict env: The environment variables to read the configuration
+        from, in place of those of the process.
+    """
     cfg = environ.config(Configuration, prefix="REST_DEMO_API")
-    return environ.to_config(cfg)
+    if env is None:
+        return environ.to_config(cfg)
+    return environ.to_config(cfg, environ=env)
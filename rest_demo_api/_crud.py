@@ -7,10 +7,13 @@ Update
 Destroy
 """
 
-from datetime import datetime
+from collections import OrderedDict
+from time import monotonic
 
 from marshmallow.exceptions import ValidationError
+from sqlalchemy import exists, func
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 from ._db import Author, Quote, get_db
 from ._schemas import AUTHOR_SCHEMA, QUOTE_SCHEMA
@@ -18,38 +21,184 @@ from .exceptions import Error
 
 db = get_db()
 
+# Seconds a cached total is trusted for. Other processes may write to
+# the database, so totals can't be cached forever.
+TOTALS_TTL = 30
+# The most totals cached at once, the least recently used going first.
+MAX_CACHED_TOTALS = 8
+_CACHED_TOTALS = OrderedDict()
+# The columns the (Mini*Schema) list schemas dump, the only ones list
+# queries fetch.
+_LIST_COLUMNS = {Author: ("id", "name"), Quote: ("id", "content")}
 
-def get_existing(model, pk):
+
+def _fresh_total(key):
     """
-    Retrieve an existing instance of a database model by the primary key.
+    Look up a cached total, dropping it if it has expired.
 
-    :param model: The model of the instance to retrieve
-    :param pk: The primary key.
+    :param key: The key the total is cached under.
 
-    :returns: The model instance.
+    :rtype: int
+    :returns: The total, or None if it isn't cached or has expired.
+    """
+    cached = _CACHED_TOTALS.get(key)
+    if cached is None:
+        return None
+    if monotonic() - cached[0] >= TOTALS_TTL:
+        del _CACHED_TOTALS[key]
+        return None
+    _CACHED_TOTALS.move_to_end(key)
+    return cached[1]
+
+
+def _cache_total(key, total):
+    """
+    Cache a total, evicting the least recently used totals past the limit.
+
+    :param key: The key to cache the total under.
+    :param int total: The total.
+    """
+    _CACHED_TOTALS[key] = (monotonic(), total)
+    _CACHED_TOTALS.move_to_end(key)
+    while len(_CACHED_TOTALS) > MAX_CACHED_TOTALS:
+        _CACHED_TOTALS.popitem(last=False)
+
+
+def _page(query, model, limit, offset, after, *extra_columns):
+    """
+    Restrict a query to a page of its results, ordered by primary key.
+
+    Only the columns listed for the model (and any extra columns) are
+    selected, as plain rows rather than model instances.
+
+    :rtype: flask_sqlalchemy.BaseQuery
+    """
+    if after is not None:
+        query = query.filter(model.id > after)
+    columns = [getattr(model, name) for name in _LIST_COLUMNS[model]]
+    query = query.with_entities(*columns, *extra_columns)
+    return query.order_by(model.id).offset(offset).limit(limit)
+
+
+def _page_with_total(key, query, model, limit, offset, after, check_empty=None):
+    """
+    Fetch a page of a query's results and the total number of results.
+
+    Unless a fresh total is cached it is counted by a subquery of the
+    statement fetching the page, rather than by a second round trip.
+
+    :param key: The key the total is cached under.
+    :param check_empty: If provided, called with no arguments when the
+        page is empty, before any total is counted or cached. Eg: to
+        raise an error if the results' parent doesn't exist.
+
+    :rtype: tuple
+    :returns: The page of results, and the total number of results.
+    """
+    total = _fresh_total(key)
+    if total is None:
+        count = query.with_entities(func.count(model.id)).correlate(None)
+        rows = _page(query, model, limit, offset, after, count.label("total")).all()
+    else:
+        rows = _page(query, model, limit, offset, after).all()
+    if not rows and check_empty is not None:
+        check_empty()
+    if total is None:
+        # No rows to read the total from if the page is empty
+        total = rows[0].total if rows else query.count()
+        _cache_total(key, total)
+    return rows, total
+
+
+def _invalidate_totals():
+    """Forget all cached totals."""
+    _CACHED_TOTALS.clear()
+
+
+def reset_caches():
+    """
+    Forget everything cached about the stored data.
+
+    For when the data is changed other than through this module, eg: by
+    tests inserting or deleting rows directly.
+    """
+    _invalidate_totals()
+
+
+def _does_not_exist():
     """
-    err = Error(
+    Produce the error for a missing entity.
+
+    :rtype: Error
+    """
+    return Error(
         error_name="EntityDoesNotExistError",
         message="Sorry, that entity doesn't exist yet!",
         response_code=404,
     )
-    try:
-        entity = model.query.get(pk)
-    except IntegrityError:
-        raise err
-    if not entity:
-        raise err
+
+
+def _author_already_exists():
+    """
+    Produce the error for a duplicate author.
+
+    :rtype: Error
+    """
+    return Error(
+        error_name="AuthorAlreadyExistsError",
+        message="That author already exists!",
+        response_code=400,
+    )
+
+
+def _quote_already_exists():
+    """
+    Produce the error for a quote its author already has.
+
+    :rtype: Error
+    """
+    return Error(
+        error_name="QuoteAlreadyExistsError",
+        message="That quote already exists!",
+        response_code=400,
+    )
+
+
+def get_existing(model, pk, *options):
+    """
+    Retrieve an existing instance of a database model by the primary key.
+
+    :param model: The model of the instance to retrieve
+    :param pk: The primary key.
+    :param options: Loader options for the query, eg: relationships
+        to load along with the instance.
+
+    :returns: The model instance.
+    """
+    entity = model.query.options(*options).get(pk)
+    if entity is None:
+        raise _does_not_exist()
     return entity
 
 
-def create_author(author_info):
+def check_exists(model, pk):
     """
-    Create a new Author.
+    Check an instance of a database model exists, without loading it.
+
+    :param model: The model of the instance to check for.
+    :param pk: The primary key.
+    """
+    if not db.session.query(exists().where(model.id == pk)).scalar():
+        raise _does_not_exist()
+
+
+def _new_author(author_info):
+    """
+    Build a new, unsaved Author.
 
     :param dict author_info: The information to use to create
         the new author.
 
-    :rtype: dict
     :returns: The new author entry.
     """
     try:
@@ -58,39 +207,60 @@ def create_author(author_info):
         raise Error(
             error_name="SchemaValidationError", message=err.messages, response_code=422
         )
-    if Author.query.filter_by(name=author_data["name"]).first() is not None:
-        raise Error(
-            error_name="AuthorAlreadyExistsError",
-            message="That author already exists!",
-            response_code=400,
-        )
     author = Author(**author_data)
-    author.posted_at = datetime.now()
-    db.session.add(author)
-    db.session.commit()
     return author
 
 
-def get_total_number_of_authors():
+def create_author(author_info):
     """
-    Get the total number of author entries in the DB.
+    Create a new Author.
 
-    :rtype: int
+    :param dict author_info: The information to use to create
+        the new author.
+
+    :rtype: dict
+    :returns: The new author entry.
     """
-    return Author.query.count()
+    author = _new_author(author_info)
+    db.session.add(author)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise _author_already_exists()
+    _invalidate_totals()
+    return author
 
 
-def list_authors(limit=50, offset=0):
+def list_authors(limit=50, offset=0, after=None):
     """
-    List all existing authors.
+    List existing authors, ordered by primary key.
 
-    :rtype: list[dict]
-    :returns: A list of all existing authors.
+    :param int limit: The maximum number of authors to return.
+    :param int offset: The number of authors to skip. Deprecated in
+        favor of ``after``, which doesn't have to scan skipped rows.
+    :param int after: If provided, only list authors whose primary
+        key is greater than this one.
+
+    :rtype: list
+    :returns: A list of existing authors, as rows of their ids and names.
     """
-    authors = Author.query.offset(offset).limit(limit).all()
+    authors = _page(Author.query, Author, limit, offset, after).all()
     return authors
 
 
+def list_authors_with_total(limit=50, offset=0, after=None):
+    """
+    List existing authors, along with the total number of authors.
+
+    Takes the same arguments as :func:`list_authors`.
+
+    :rtype: tuple
+    :returns: A list of existing authors, and the total number of authors.
+    """
+    return _page_with_total("authors", Author.query, Author, limit, offset, after)
+
+
 def read_author(pk):
     """
     Get a single author.
@@ -126,9 +296,12 @@ def update_author(pk, author_info, partial=False):
     # Update the object
     for key in author_data:
         setattr(author, key, author_data[key])
-    author.updated_at = datetime.now()
     db.session.add(author)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise _author_already_exists()
     return author
 
 
@@ -138,12 +311,14 @@ def delete_author(pk):
 
     :param int pk: The primary key of the author to delete
     """
-    author = get_existing(Author, pk)
-    # TODO: Replace with a cascade in the model?
-    for quote in author.quotes:
-        db.session.delete(quote)
-    db.session.delete(author)
+    # Delete the author's quotes in one statement, rather than
+    # loading them and deleting them one at a time.
+    Quote.query.filter(Quote.author_id == pk).delete(synchronize_session=False)
+    if not Author.query.filter(Author.id == pk).delete(synchronize_session=False):
+        db.session.rollback()
+        raise _does_not_exist()
     db.session.commit()
+    _invalidate_totals()
 
 
 def create_quote(quote_info):
@@ -165,49 +340,67 @@ def create_quote(quote_info):
     # Intelligently handle dynamically adding the author if required.
     author = Author.query.filter(Author.name == quote_data["author"]["name"]).first()
     if author is None:
-        author = create_author(quote_info["author"])
-    else:
-        # If the author already exists check the quote is unique
-        # in _that author's_ list of quotes.
-        if (
-            Quote.query.join(Author)
-            .filter(Quote.content == quote_data["content"])
-            .filter(Author.name == author.name)
-            .first()
-        ):
-            raise Error(
-                error_name="QuoteAlreadyExistsError",
-                message="That quote already exists!",
-                response_code=400,
-            )
+        # Saved along with the quote. The lookup already found no author
+        # by that name, and the unique name catches one created since.
+        author = _new_author(quote_info["author"])
+    return _add_quote(quote_data, author)
+
+
+def _add_quote(quote_data, author):
+    """
+    Save a new quote by an author, and the author too if they're new.
+
+    :param dict quote_data: The loaded information for the quote.
+    :param author: The author of the quote.
+
+    :returns: The new quote entry
+    """
+    new_author = author.id is None
     # Inject the Author DB object into the data to prep
     # for creating the Quote DB object...
     quote_data["author"] = author
     quote = Quote(**quote_data)
-    quote.posted_at = datetime.now()
     db.session.add(quote)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        # A new author can't have the quote already, but someone
+        # else may have just created them.
+        if new_author:
+            raise _author_already_exists()
+        raise _quote_already_exists()
+    _invalidate_totals()
     return quote
 
 
-def get_total_number_of_quotes():
+def list_quotes(limit=50, offset=0, after=None):
     """
-    Get the total number of quote entries in the DB.
+    List existing quotes, ordered by primary key.
 
-    :rtype: int
+    :param int limit: The maximum number of quotes to return.
+    :param int offset: The number of quotes to skip. Deprecated in
+        favor of ``after``, which doesn't have to scan skipped rows.
+    :param int after: If provided, only list quotes whose primary
+        key is greater than this one.
+
+    :rtype: list
+    :returns: A list of quotes, as rows of their ids and contents.
     """
-    return Quote.query.count()
+    quotes = _page(Quote.query, Quote, limit, offset, after).all()
+    return quotes
 
 
-def list_quotes(limit=50, offset=0):
+def list_quotes_with_total(limit=50, offset=0, after=None):
     """
-    List all existing quotes.
+    List existing quotes, along with the total number of quotes.
 
-    :rtype: list[dict]
-    :returns: A list of all the quotes.
+    Takes the same arguments as :func:`list_quotes`.
+
+    :rtype: tuple
+    :returns: A list of quotes, and the total number of quotes.
     """
-    quotes = Quote.query.offset(offset).limit(limit).all()
-    return quotes
+    return _page_with_total("quotes", Quote.query, Quote, limit, offset, after)
 
 
 def read_quote(pk):
@@ -218,7 +411,8 @@ def read_quote(pk):
     :rtype: dict
     :returns: The quote entry.
     """
-    quote = get_existing(Quote, pk)
+    # The author is serialized along with the quote
+    quote = get_existing(Quote, pk, joinedload(Quote.author))
     return quote
 
 
@@ -252,13 +446,16 @@ def update_quote(pk, quote_info, partial=False):
             + "authors endpoint for that!",
             response_code=400,
         )
-    for key in quote_info:
+    for key, value in quote_data.items():
         if key == "author":
             continue
-        setattr(quote, key, quote_data[key])
-    quote.updated_at = datetime.now()
+        setattr(quote, key, value)
     db.session.add(quote)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise _quote_already_exists()
     return quote
 
 
@@ -268,9 +465,10 @@ def delete_quote(pk):
 
     :param int pk: The primary key of the quote to delete.
     """
-    quote = get_existing(Quote, pk)
-    db.session.delete(quote)
+    if not Quote.query.filter(Quote.id == pk).delete(synchronize_session=False):
+        raise _does_not_exist()
     db.session.commit()
+    _invalidate_totals()
 
 
 def create_author_quote(pk, quote_info):
@@ -284,36 +482,55 @@ def create_author_quote(pk, quote_info):
     :returns: The new quote entry
     """
     author = get_existing(Author, pk)
-    # Insert the author
-    quote_info["author"] = AUTHOR_SCHEMA.dump(author).data
-    return create_quote(quote_info)
+    try:
+        quote_data = QUOTE_SCHEMA.load(quote_info, partial=("author",)).data
+    except ValidationError as err:
+        raise Error(
+            error_name="SchemaValidationError", message=err.messages, response_code=422
+        )
+    return _add_quote(quote_data, author)
 
 
-def get_total_number_of_author_quotes(pk):
+def list_author_quotes(pk, limit=50, offset=0, after=None):
     """
-    Get the total number of quotes for this author in the DB.
+    List quotes by a given author, ordered by primary key.
 
-    :rtype: int
-    """
-    author = get_existing(Author, pk)
-    return Quote.query.join(Author).filter(Author.id == author.id).count()
+    :param int pk: The primary key
+    :param int limit: The maximum number of quotes to return.
+    :param int offset: The number of quotes to skip. Deprecated in
+        favor of ``after``, which doesn't have to scan skipped rows.
+    :param int after: If provided, only list quotes whose primary
+        key is greater than this one.
+
+    :rtype: list
+    :returns: A list of quotes, as rows of their ids and contents.
+    """
+    query = Quote.query.filter(Quote.author_id == pk)
+    quotes = _page(query, Quote, limit, offset, after).all()
+    if not quotes:
+        # Tell an author without quotes here apart from a missing author
+        check_exists(Author, pk)
+    return quotes
 
 
-def list_author_quotes(pk, limit=50, offset=0):
+def list_author_quotes_with_total(pk, limit=50, offset=0, after=None):
     """
-    List quotes by a given author.
+    List quotes by a given author, along with the author's total quotes.
 
-    :param int pk: The primary key
+    Takes the same arguments as :func:`list_author_quotes`.
 
-    :rtype: list[dict]
-    :returns: A list of quotes
+    :rtype: tuple
+    :returns: A list of quotes, and the total number of the author's quotes.
     """
-    author = get_existing(Author, pk)
-    quotes = (
-        Quote.query.join(Author)
-        .filter(Author.id == author.id)
-        .offset(offset)
-        .limit(limit)
-        .all()
+    query = Quote.query.filter(Quote.author_id == pk)
+    # Tell an author without quotes here apart from a missing author,
+    # and don't cache a total for a missing one.
+    return _page_with_total(
+        ("author_quotes", pk),
+        query,
+        Quote,
+        limit,
+        offset,
+        after,
+        check_empty=lambda: check_exists(Author, pk),
     )
-    return quotes
@@ -1,8 +1,55 @@
 """Database logic + Models."""
 
+from datetime import datetime
+from hashlib import sha256
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import validates
 
 _CACHED_DB = None
+# Seconds a pooled connection is used for before being replaced, to stay
+# under the idle timeouts of servers and proxies
+POOL_RECYCLE = 1800
+
+
+class _SQLAlchemy(SQLAlchemy):
+    """SQLAlchemy, with connection pooling defaults for database servers."""
+
+    def apply_driver_hacks(self, app, info, options):
+        """Add pooling defaults to the engine options."""
+        # SQLite doesn't hold connections open to a server, and recycling
+        # the connection to an in memory database would lose the data
+        if not info.drivername.startswith("sqlite"):
+            # Check connections are still alive when they're checked out,
+            # rather than failing the first request after they're dropped
+            options.setdefault("pool_pre_ping", True)
+            options.setdefault("pool_recycle", POOL_RECYCLE)
+        super().apply_driver_hacks(app, info, options)
+
+
+def configure_engine(engine):
+    """
+    Set up the connections the app's engine makes.
+
+    SQLite databases are put in write-ahead logging mode. In WAL mode
+    readers don't block on a writer (or the other way around), so list
+    requests aren't held up by concurrent writes.
+
+    :param engine: The app's engine, before it makes any connections.
+    """
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _use_wal)
+
+
+def _use_wal(dbapi_connection, connection_record):  # pylint: disable=W0613
+    """Put a SQLite connection's database in write-ahead logging mode."""
+    cursor = dbapi_connection.cursor()
+    # In memory databases stay in "memory" journal mode
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Syncing at checkpoints rather than every commit is still durable with WAL
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
 
 
 def get_db():
@@ -17,7 +64,9 @@ def get_db():
     global _CACHED_DB  # pylint: disable=W0603
     if _CACHED_DB is not None:
         return _CACHED_DB
-    database = SQLAlchemy()
+    # Sessions only last a request, and the objects written in one are
+    # then just serialized, so don't re-read them from the db after commit
+    database = _SQLAlchemy(session_options={"expire_on_commit": False})
     _CACHED_DB = database
     return database
 
@@ -30,19 +79,47 @@ class Author(db.Model):  # pylint: disable=R0903
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True)
-    posted_at = db.Column(db.DateTime)
-    updated_at = db.Column(db.DateTime)
+    # Naive UTC, filled in by SQLAlchemy as rows are written
+    posted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     date_of_birth = db.Column(db.Date)
     date_of_death = db.Column(db.Date)
+    # Lazily loaded, rather than eagerly: reading a quote loads its
+    # author, which shouldn't drag in all of their other quotes too
+    quotes = db.relationship(
+        "Quote", back_populates="author", cascade="all, delete-orphan"
+    )
 
 
 class Quote(db.Model):  # pylint: disable=R0903
     """Quote database model."""
 
+    # An author can't have the same quote twice. Enforced here, rather
+    # than by checking before every insert. Quotes can be any length, so
+    # the constraint is on a hash of the content, which always fits in
+    # an index entry.
+    __table_args__ = (
+        db.UniqueConstraint(
+            "author_id", "content_hash", name="uq_quote_author_content_hash"
+        ),
+        # An author's quotes are listed (and paged through) in id order
+        db.Index("ix_quote_author_id", "author_id", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.String, nullable=False)
+    # Hex SHA-256 of the content, set along with it
+    content_hash = db.Column(db.String(64), nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey("author.id"))
-    author = db.relationship("Author", backref=db.backref("quotes", lazy="dynamic"))
-    posted_at = db.Column(db.DateTime)
-    updated_at = db.Column(db.DateTime)
+    author = db.relationship("Author", back_populates="quotes")
+    # Naive UTC, filled in by SQLAlchemy as rows are written
+    posted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     context = db.Column(db.String(500))
+
+    @validates("content")
+    def _hash_content(self, key, content):  # pylint: disable=W0613
+        """Update the hash of the content whenever the content is set."""
+        if content is not None:
+            self.content_hash = sha256(content.encode("utf-8")).hexdigest()
+        return content
@@ -0,0 +1,195 @@
+"""URL routing."""
+
+import re
+
+from werkzeug.routing import IntegerConverter, Map, MapAdapter, UnicodeConverter
+
+_VARIABLE_SEGMENT = re.compile(r"^<(?:(\w+):)?(\w+)>$")
+
+
+class _Node:  # pylint: disable=R0903
+    """A node in the route tree."""
+
+    __slots__ = ("static", "variables", "rules")
+
+    def __init__(self):
+        # Static path segment -> child node
+        self.static = {}
+        # (converter, variable name, child node), integers first
+        self.variables = []
+        # The rules which end at this node
+        self.rules = []
+
+    def child(self, converter, value):
+        """Return (creating it if required) a child of this node."""
+        if converter is None:
+            return self.static.setdefault(value, _Node())
+        for existing_converter, name, node in self.variables:
+            if existing_converter is converter and name == value:
+                return node
+        node = _Node()
+        self.variables.append((converter, value, node))
+        self.variables.sort(key=lambda variable: variable[0] is not int)
+        return node
+
+
+def _lookup(node, segments, index, values):
+    """
+    Walk the route tree, preferring static segments over variables.
+
+    :rtype: tuple
+    :returns: The matching rules and the values of the path variables,
+        or None if nothing matched.
+    """
+    if index == len(segments):
+        if node.rules:
+            return node.rules, values
+        return None
+    segment = segments[index]
+    child = node.static.get(segment)
+    if child is not None:
+        found = _lookup(child, segments, index + 1, values)
+        if found is not None:
+            return found
+    for converter, name, child in node.variables:
+        if converter is int:
+            if not segment.isdecimal():
+                continue
+            value = int(segment)
+        elif segment:
+            value = segment
+        else:
+            continue
+        found = _lookup(child, segments, index + 1, dict(values, **{name: value}))
+        if found is not None:
+            return found
+    return None
+
+
+class TrieMap(Map):
+    """
+    A URL map which matches simple rules by walking a tree of path segments.
+
+    Werkzeug matches a path by trying the regular expression of every
+    rule in turn. Rules made of static segments and plain integer or
+    string variables are also indexed here in a tree keyed by path
+    segment, so matching them costs one dict lookup per segment.
+    Anything the tree can't answer (redirects, 404s, 405s, rules using
+    other converters) falls through to Werkzeug's matching.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._route_tree = None
+        super().__init__(*args, **kwargs)
+
+    def add(self, rulefactory):
+        """Add a rule to the map, invalidating the route tree."""
+        super().add(rulefactory)
+        self._route_tree = None
+
+    def bind(self, *args, **kwargs):  # pylint: disable=W0221
+        """Return a :class:`TrieMapAdapter` for the map."""
+        return TrieMapAdapter.from_adapter(super().bind(*args, **kwargs))
+
+    def bind_to_environ(self, *args, **kwargs):  # pylint: disable=W0221
+        """Return a :class:`TrieMapAdapter` for the map."""
+        # Werkzeug calls Map.bind directly here, rather than self.bind
+        return TrieMapAdapter.from_adapter(super().bind_to_environ(*args, **kwargs))
+
+    def lookup(self, path_info, method):
+        """
+        Match a path against the route tree.
+
+        :param str path_info: The path to match.
+        :param str method: The (upper case) HTTP method of the request.
+
+        :rtype: tuple
+        :returns: The matching rule and the values of its variables, or
+            None if the route tree can't answer.
+        """
+        if self._route_tree is None:
+            self._route_tree = self._build_route_tree()
+        segments = ("/" + path_info.lstrip("/")).split("/")[1:]
+        found = _lookup(self._route_tree, segments, 0, {})
+        if found is None:
+            return None
+        rules, values = found
+        for rule in rules:
+            if rule.methods is None or method in rule.methods:
+                return rule, values
+        return None
+
+    def _build_route_tree(self):
+        """Index every rule the tree can handle."""
+        tree = _Node()
+        for rule in self.iter_rules():
+            segments = self._parse_segments(rule)
+            if segments is None:
+                continue
+            node = tree
+            for converter, value in segments:
+                node = node.child(converter, value)
+            node.rules.append(rule)
+        return tree
+
+    def _parse_segments(self, rule):
+        """
+        Split a rule into (converter, value) pairs, one per path segment.
+
+        :returns: The segments, or None if the tree can't handle the rule.
+        """
+        if (
+            rule.redirect_to is not None
+            or rule.build_only
+            or rule.subdomain
+            or rule.host
+            or not rule.rule.startswith("/")
+            or any(other.defaults for other in self.iter_rules(rule.endpoint))
+        ):
+            return None
+        segments = []
+        for segment in rule.rule.split("/")[1:]:
+            if "<" not in segment:
+                segments.append((None, segment))
+                continue
+            match = _VARIABLE_SEGMENT.match(segment)
+            if match is None:
+                return None
+            converter = self.converters.get(match.group(1) or "default")
+            if converter is IntegerConverter:
+                segments.append((int, match.group(2)))
+            elif converter is UnicodeConverter:
+                segments.append((str, match.group(2)))
+            else:
+                return None
+        return segments
+
+
+class TrieMapAdapter(MapAdapter):
+    """A map adapter which tries its map's route tree first."""
+
+    @classmethod
+    def from_adapter(cls, adapter):
+        """Build a :class:`TrieMapAdapter` with the details of another adapter."""
+        return cls(
+            adapter.map,
+            adapter.server_name,
+            adapter.script_name,
+            adapter.subdomain,
+            adapter.url_scheme,
+            adapter.path_info,
+            adapter.default_method,
+            adapter.query_args,
+        )
+
+    def match(self, path_info=None, method=None, return_rule=False, query_args=None):
+        """Match a path, see :meth:`werkzeug.routing.MapAdapter.match`."""
+        path = self.path_info if path_info is None else path_info
+        if isinstance(path, str) and not self.subdomain and not self.map.host_matching:
+            found = self.map.lookup(path, (method or self.default_method).upper())
+            if found is not None:
+                rule, values = found
+                if return_rule:
+                    return rule, values
+                return rule.endpoint, values
+        return super().match(path_info, method, return_rule, query_args)
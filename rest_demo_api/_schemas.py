@@ -1,6 +1,13 @@
 """Schemas."""
 
-from marshmallow import Schema, ValidationError, fields
+from operator import attrgetter
+
+import attr
+import orjson
+from marshmallow import Schema, ValidationError, fields, missing
+
+# Fields whose values orjson serializes exactly like marshmallow does
+_NATIVE_FIELDS = (fields.Integer, fields.String, fields.Date, fields.DateTime)
 
 
 def must_not_be_blank(data):
@@ -9,7 +16,53 @@ def must_not_be_blank(data):
         raise ValidationError("Data not provided.")
 
 
-class AuthorSchema(Schema):
+_CACHED_API_MODULE = None
+
+
+def _collection_url(resource_name):
+    """
+    Produce the URL of an API collection resource.
+
+    :param str resource_name: The name of the resource class in ``_api``.
+
+    :rtype: str
+    """
+    # Bit of weirdness to avoid a cyclic import, done once rather
+    # than for every dumped object.
+    global _CACHED_API_MODULE  # pylint: disable=W0603
+    if _CACHED_API_MODULE is None:
+        from . import _api
+
+        _CACHED_API_MODULE = _api
+    api_module = _CACHED_API_MODULE
+    return api_module.collection_url(getattr(api_module, resource_name))
+
+
+# The URLs of entities are formatted from the (cached) URLs of their
+# collections, rather than each one being built through the URL map.
+
+
+class AuthorUrlsMixin:
+    """Methods producing the URLs of an Author, for Method fields."""
+
+    def get_url(self, author):  # pylint: disable=R0201
+        """Produce the url for the Author."""
+        return "{}/{}".format(_collection_url("Authors"), author.id)
+
+    def get_quotes_url(self, author):  # pylint: disable=R0201
+        """Produce the url for the author's quotes."""
+        return "{}/{}/quotes".format(_collection_url("Authors"), author.id)
+
+
+class QuoteUrlsMixin:  # pylint: disable=R0903
+    """Methods producing the URLs of a Quote, for Method fields."""
+
+    def get_url(self, quote):  # pylint: disable=R0201
+        """Produce the URL for the Quote."""
+        return "{}/{}".format(_collection_url("Quotes"), quote.id)
+
+
+class AuthorSchema(AuthorUrlsMixin, Schema):
     """Schema for Author objects."""
 
     class Meta:  # pylint: disable=C0111,R0903
@@ -26,25 +79,8 @@ class AuthorSchema(Schema):
     date_of_birth = fields.Date()
     date_of_death = fields.Date()
 
-    def get_url(self, author):  # pylint: disable=R0201
-        """Produce the url for the Author."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api
-        from ._api import Author as AuthorEndpoint
-
-        api = get_api()
-        return api.url_for(AuthorEndpoint, pk=author.id)
 
-    def get_quotes_url(self, author):  # pylint: disable=R0201
-        """Produce the url for the author's quotes."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api, AuthorQuotes
-
-        api = get_api()
-        return api.url_for(AuthorQuotes, pk=author.id)
-
-
-class MiniAuthorSchema(Schema):
+class MiniAuthorSchema(AuthorUrlsMixin, Schema):
     """Schema for embedded or listed Author objects."""
 
     class Meta:  # pylint: disable=C0111,R0903
@@ -56,17 +92,8 @@ class MiniAuthorSchema(Schema):
     name = fields.Str(required=True, validate=must_not_be_blank)
     url = fields.Method("get_url", dump_only=True)
 
-    def get_url(self, author):  # pylint: disable=R0201
-        """Produce the url for the Author."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api
-        from ._api import Author as AuthorEndpoint
 
-        api = get_api()
-        return api.url_for(AuthorEndpoint, pk=author.id)
-
-
-class QuoteSchema(Schema):
+class QuoteSchema(QuoteUrlsMixin, Schema):
     """Schema for Quote objects."""
 
     class Meta:  # pylint: disable=C0111,R0903
@@ -84,18 +111,9 @@ class QuoteSchema(Schema):
     updated_at = fields.DateTime(dump_only=True)
     context = fields.Str()
 
-    def get_url(self, quote):  # pylint: disable=R0201
-        """Produce the URL for the Quote."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api
-        from ._api import Quote as QuoteEndpoint
-
-        api = get_api()
-        return api.url_for(QuoteEndpoint, pk=quote.id)
-
 
 # Required for auto-documentation.
-class QuoteWithImpliedAuthorSchema(Schema):
+class QuoteWithImpliedAuthorSchema(QuoteUrlsMixin, Schema):
     """Schema for Quote objects with an implied Author."""
 
     class Meta:  # pylint: disable=C0111,R0903
@@ -110,17 +128,8 @@ class QuoteWithImpliedAuthorSchema(Schema):
     updated_at = fields.DateTime(dump_only=True)
     context = fields.Str()
 
-    def get_url(self, quote):  # pylint: disable=R0201
-        """Produce the URL for the Quote."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api
-        from ._api import Quote as QuoteEndpoint
-
-        api = get_api()
-        return api.url_for(QuoteEndpoint, pk=quote.id)
 
-
-class MiniQuoteSchema(Schema):
+class MiniQuoteSchema(QuoteUrlsMixin, Schema):
     """Schema for embbeded or listed Quote objects."""
 
     class Meta:  # pylint: disable=C0111,R0903
@@ -132,14 +141,23 @@ class MiniQuoteSchema(Schema):
     content = fields.Str(required=True, validate=must_not_be_blank)
     url = fields.Method("get_url", dump_only=True)
 
-    def get_url(self, quote):  # pylint: disable=R0201
-        """Produce the URL for the Quote."""
-        # Bit of weirdness to avoid a cyclic import...
-        from ._api import get_api
-        from ._api import Quote as QuoteEndpoint
 
-        api = get_api()
-        return api.url_for(QuoteEndpoint, pk=quote.id)
+@attr.s(slots=True)
+class Page:  # pylint: disable=R0903
+    """
+    A page of a paginated collection.
+
+    Marshmallow re-binds a schema's fields every time it dumps a dict,
+    but only once per type for other objects, so the list schemas are
+    handed these instead of plain dicts.
+    """
+
+    items = attr.ib()
+    next_page = attr.ib()
+    limit = attr.ib()
+    offset = attr.ib()
+    # Left out of the dumped data unless it's set
+    total = attr.ib(default=missing)
 
 
 class Paginated(Schema):
@@ -148,7 +166,7 @@ class Paginated(Schema):
     next_page = fields.Url(relative=True)
     limit = fields.Int(required=True, validator=must_not_be_blank)
     offset = fields.Int(required=True, validator=must_not_be_blank)
-    total = fields.Int(required=True)
+    total = fields.Int()
 
 
 class AuthorList(Paginated):
@@ -163,9 +181,117 @@ class QuoteList(Paginated):
     items = fields.Nested("MiniQuoteSchema", many=True)
 
 
+def _compile_getters(schema):
+    """
+    Build a (name, getter) pair for every field a schema dumps.
+
+    :param schema: The schema instance to compile.
+
+    :rtype: tuple
+    """
+    getters = []
+    for name, field in schema.fields.items():
+        if field.load_only:
+            continue
+        attribute = field.attribute or name
+        if isinstance(field, fields.Method):
+            getters.append((name, getattr(schema, field.serialize_method_name)))
+        elif isinstance(field, fields.Nested) and not field.many:
+            getters.append(
+                (name, _nested_getter(attribute, _compile_getters(field.schema)))
+            )
+        elif isinstance(field, _NATIVE_FIELDS) and not getattr(
+            field, "dateformat", None
+        ):
+            getters.append((name, attrgetter(attribute)))
+        else:
+            raise TypeError(
+                "Can't compile a dumper for the {} field {!r}".format(
+                    type(field).__name__, name
+                )
+            )
+    return tuple(getters)
+
+
+def _nested_getter(attribute, getters):
+    """Produce a getter which dumps a nested object."""
+    get_nested = attrgetter(attribute)
+
+    def getter(obj):
+        nested = get_nested(obj)
+        if nested is None:
+            return None
+        return {name: get(nested) for name, get in getters}
+
+    return getter
+
+
+def _dict_builder(schema):
+    """Produce a function building the dict a schema would dump an object to."""
+    getters = _compile_getters(schema)
+
+    def build(obj):
+        return {name: get(obj) for name, get in getters}
+
+    return build
+
+
+def compile_dumper(schema):
+    """
+    Specialize a schema's dump into a function producing JSON bytes.
+
+    The schema's fields are looked up once, here, rather than on every
+    dump, and the values are handed straight to orjson.
+
+    :param schema: The schema instance to compile.
+
+    :returns: A function which takes an object and returns the same JSON
+        ``schema.dump(obj).data`` would serialize to, as bytes.
+    """
+    build = _dict_builder(schema)
+
+    def dump(obj):
+        return orjson.dumps(build(obj), option=orjson.OPT_NAIVE_UTC)
+
+    return dump
+
+
+def compile_page_dumper(schema):
+    """
+    Specialize a paginated list schema's dump of a :class:`Page`.
+
+    The items are dumped with their compiled schema, and the whole page
+    is handed to orjson in a single call.
+
+    :param schema: The (:class:`Paginated`) schema instance to compile.
+
+    :returns: A function which takes a :class:`Page` and returns the same
+        JSON ``schema.dump(page).data`` would serialize to, as bytes.
+    """
+    build_item = _dict_builder(schema.fields["items"].schema)
+
+    def dump(page):
+        data = {
+            "items": [build_item(item) for item in page.items],
+            "next_page": page.next_page,
+            "limit": page.limit,
+            "offset": page.offset,
+        }
+        if page.total is not missing:
+            data["total"] = page.total
+        return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC)
+
+    return dump
+
+
 AUTHOR_SCHEMA = AuthorSchema()
 # AUTHORS_SCHEMA = AuthorSchema(many=True, only=("name", "id", "url"))
 AUTHORS_SCHEMA = AuthorList()
 QUOTE_SCHEMA = QuoteSchema()
 # QUOTES_SCHEMA = QuoteSchema(many=True, only=("id", "url", "content"))
 QUOTES_SCHEMA = QuoteList()
+
+dump_author_json = compile_dumper(AUTHOR_SCHEMA)  # pylint: disable=C0103
+dump_quote_json = compile_dumper(QUOTE_SCHEMA)  # pylint: disable=C0103
+dump_authors_json = compile_page_dumper(AUTHORS_SCHEMA)  # pylint: disable=C0103
+dump_quotes_json = compile_page_dumper(QUOTES_SCHEMA)  # pylint: disable=C0103
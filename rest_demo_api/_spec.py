@@ -5,13 +5,20 @@ from apispec_webframeworks.flask import FlaskPlugin
 
 from . import __version__, get_app
 
+_CACHED_SPEC = None
+
 
 def get_spec():
     """
     Produce the OpenAPIv3 spec document.
 
+    The spec only changes between deploys, so it is built once per process.
+
     :rtype: dict
     """
+    global _CACHED_SPEC  # pylint: disable=W0603
+    if _CACHED_SPEC is not None:
+        return _CACHED_SPEC
     spec = APISpec(
         title="rest-demo-api",
         version=__version__,
@@ -29,4 +36,5 @@ def get_spec():
     )
     spec.path("/quotes", view=app.view_functions["quotes"], app=app)
     spec.path("/quotes/{quote_id}", view=app.view_functions["quote"], app=app)
-    return spec.to_dict()
+    _CACHED_SPEC = spec.to_dict()
+    return _CACHED_SPEC
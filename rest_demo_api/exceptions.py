@@ -3,7 +3,7 @@
 import attr
 
 
-@attr.s
+@attr.s(slots=True)
 class Error(Exception):
     """Base error class."""
 
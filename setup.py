@@ -8,7 +8,7 @@ VERSION = "0.0.1"
 AUTHOR = "Brian Balsamo"
 AUTHOR_EMAIL = "Brian@BrianBalsamo.com"
 URL = 'https://github.com/bnbalsamo/rest_demo_api'
-PYTHON_REQUIRES= ">=3"
+PYTHON_REQUIRES= ">=3.7"
 INSTALL_REQUIRES = [
     "aniso8601==6.0.0",
     "apispec==1.2.1",
@@ -23,6 +23,7 @@ INSTALL_REQUIRES = [
     "Jinja2==2.10.1",
     "MarkupSafe==1.1.1",
     "marshmallow==2.19.2",
+    "orjson==3.9.7",
     "pytz==2019.1",
     "PyYAML==5.1",
     "six==1.12.0",